@@ -1,23 +1,20 @@
-import csv
 import io
+import math
 import re
 import zipfile
 from dataclasses import dataclass, field
+from functools import cached_property
+from itertools import accumulate
 
+import numpy as np
+import pandas as pd
 import streamlit as st
 from reportlab.lib import colors
-from reportlab.lib.enums import TA_RIGHT
 from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.units import inch
-from reportlab.platypus import (
-    PageBreak,
-    Paragraph,
-    SimpleDocTemplate,
-    Spacer,
-    Table,
-    TableStyle,
-)
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfgen import canvas
 
 # ---------------------------------------------------------------------------
 # Data classes
@@ -38,15 +35,17 @@ class ArtistReport:
     commission_rate: float  # 0.20 means 20%
     sales: list[SaleRecord] = field(default_factory=list)
 
-    @property
+    # Computed on first access and then stored on the instance; sales must be
+    # complete before any of these are read.
+    @cached_property
     def total_net_sales(self) -> float:
-        return round(sum(s.net_sales for s in self.sales), 2)
+        return round(math.fsum(s.net_sales for s in self.sales), 2)
 
-    @property
+    @cached_property
     def gallery_commission(self) -> float:
         return round(self.total_net_sales * self.commission_rate, 2)
 
-    @property
+    @cached_property
     def artist_payout(self) -> float:
         return round(self.total_net_sales - self.gallery_commission, 2)
 
@@ -56,6 +55,20 @@ class ArtistReport:
 # ---------------------------------------------------------------------------
 
 _COMMISSION_RE = re.compile(r"\((\d+)\)\s*$")
+_FILENAME_STRIP_RE = re.compile(r"[^\w\s-]")  # non-alphanumeric (keep spaces/hyphens)
+_FILENAME_WS_RE = re.compile(r"\s+")
+# ASCII fast path for _sanitise_filename: deletes what _FILENAME_STRIP_RE would
+_FILENAME_ASCII_TRANS = str.maketrans(
+    "",
+    "",
+    "".join(
+        ch
+        for ch in map(chr, range(128))
+        if not (ch.isalnum() or ch.isspace() or ch in "_-")
+    ),
+)
+_DOLLAR_TRANS = str.maketrans("", "", "$, \t\r\n")
+_NUMERIC_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)")
 
 
 def parse_category(category: str) -> tuple[str, float]:
@@ -63,16 +76,20 @@ def parse_category(category: str) -> tuple[str, float]:
 
     Returns ("", 0.0) for None / empty categories (sentinel value).
     """
-    if not category or category.strip().lower() == "none":
+    if not category:
+        return ("", 0.0)
+    category = category.strip()
+    # Only a 4-character value can be "none", so lower() runs on those alone
+    if not category or (len(category) == 4 and category.lower() == "none"):
         return ("", 0.0)
 
     match = _COMMISSION_RE.search(category)
     if match:
         rate = int(match.group(1)) / 100.0
-        name_part = category[: match.start()].strip()
+        name_part = category[: match.start()]
     else:
         rate = 0.30  # default 30%
-        name_part = category.strip()
+        name_part = category
 
     # Strip leading '#' prefix used by some gallery categories
     name_part = name_part.lstrip("#").strip()
@@ -80,15 +97,25 @@ def parse_category(category: str) -> tuple[str, float]:
     return (name_part, rate)
 
 
-def parse_dollar(value: str) -> float:
-    """Parse a dollar string like '$25.00' or '-$2.00' into a float."""
-    cleaned = value.replace("$", "").replace(",", "").strip()
-    if not cleaned:
-        return 0.0
-    try:
-        return float(cleaned)
-    except ValueError:
-        return 0.0
+def parse_dollars(values: pd.Series) -> pd.Series:
+    """Parse a column of dollar strings like '$25.00' or '-$2.00' into floats.
+
+    Malformed or empty cells parse as 0.0.
+    """
+    cleaned = values.str.translate(_DOLLAR_TRANS)
+    # Only plain decimals convert; anything else (e.g. '1e3', 'inf') is 0.0
+    cleaned = cleaned.where(cleaned.str.fullmatch(_NUMERIC_RE, na=False))
+    return pd.to_numeric(cleaned, errors="coerce").fillna(0.0).astype("float64")
+
+
+def parse_qtys(values: pd.Series) -> pd.Series:
+    """Parse a column of quantity strings into ints, truncating decimals.
+
+    Malformed or empty cells parse as 0.
+    """
+    qty = pd.to_numeric(values, errors="coerce")
+    # Values outside int64 (including inf) would wrap silently in astype()
+    return qty.where(qty.abs() < 2**63).fillna(0).astype(int)
 
 
 # ---------------------------------------------------------------------------
@@ -97,48 +124,67 @@ def parse_dollar(value: str) -> float:
 
 
 def process_csv(
-    rows: list[dict],
-) -> tuple[dict[str, ArtistReport], list[dict]]:
+    df: pd.DataFrame,
+) -> tuple[dict[str, ArtistReport], pd.DataFrame]:
     """Group CSV rows by artist and build commission reports.
 
     Returns (artists_dict, skipped_rows) where skipped_rows are rows with
     None/empty Category.
     """
-    artists: dict[str, ArtistReport] = {}
-    skipped: list[dict] = []
-
-    for row in rows:
-        category = row.get("Category", "").strip()
-        artist_name, commission_rate = parse_category(category)
-
-        if not artist_name:
-            skipped.append(row)
-            continue
-
-        net_sales = parse_dollar(row.get("Net Sales", ""))
-
-        try:
-            qty = int(float(row.get("Qty", "0") or "0"))
-        except ValueError:
-            qty = 0
-
-        sale = SaleRecord(
-            date=row.get("Date", ""),
-            item=row.get("Item", ""),
-            qty=qty,
-            net_sales=net_sales,
+    category = df["Category"].fillna("").str.strip()
+
+    # Categories repeat on every sale, so parse each distinct one only once
+    uniques = category.unique()
+    parsed = pd.DataFrame(
+        [parse_category(c) for c in uniques],
+        index=uniques,
+        columns=["artist", "rate"],
+    )
+    artist = category.map(parsed["artist"])
+    has_artist = artist != ""
+
+    skipped = df[~has_artist]
+    sales = df.loc[has_artist, ["Date", "Item", "Qty", "Net Sales"]]
+
+    dates = sales["Date"].fillna("")
+
+    # Build every SaleRecord in one C-level map over plain column lists, then
+    # hand each artist their rows by position: no per-row dicts or lookups
+    records = list(
+        map(
+            SaleRecord,
+            dates.tolist(),
+            sales["Item"].fillna("").tolist(),
+            parse_qtys(sales["Qty"]).tolist(),
+            parse_dollars(sales["Net Sales"]).tolist(),
         )
+    )
+    rates = category[has_artist].map(parsed["rate"]).tolist()
+
+    # Integer-code the artists once, then get each artist's row positions
+    # from vectorised passes over the codes
+    codes, names = pd.factorize(artist[has_artist])
+    counts = np.bincount(codes, minlength=len(names))
+    _, first_rows = np.unique(codes, return_index=True)
+
+    # Order rows by date, then group them by artist. Exports usually arrive
+    # in date order, so the date sort is skipped when it would be a no-op;
+    # both sorts are stable, keeping file order for sales on the same date.
+    order = np.arange(len(codes))
+    if not dates.is_monotonic_increasing:
+        order = dates.argsort(kind="stable").to_numpy()
+    order = order[np.argsort(codes[order], kind="stable")]
+    positions = np.split(order, np.cumsum(counts)[:-1])
 
-        if artist_name not in artists:
-            artists[artist_name] = ArtistReport(
-                name=artist_name,
-                commission_rate=commission_rate,
-            )
-        artists[artist_name].sales.append(sale)
-
-    # Sort each artist's sales by date
-    for report in artists.values():
-        report.sales.sort(key=lambda s: s.date)
+    artists: dict[str, ArtistReport] = {}
+    for artist_name, first, idx in zip(names.tolist(), first_rows.tolist(), positions):
+        report = ArtistReport(
+            name=artist_name,
+            # An artist keeps the rate from their first sale in the file
+            commission_rate=rates[first],
+            sales=[records[i] for i in idx.tolist()],
+        )
+        artists[artist_name] = report
 
     return (artists, skipped)
 
@@ -148,138 +194,260 @@ def process_csv(
 # ---------------------------------------------------------------------------
 
 
+# The report is a fixed template (heading, one table, three summary lines),
+# so it is drawn straight onto a canvas at precomputed positions rather than
+# going through the Platypus layout engine. All measurements are in points.
+_PAGE_WIDTH, _PAGE_HEIGHT = letter
+_CONTENT_LEFT = 0.75 * inch + 6
+_CONTENT_TOP = _PAGE_HEIGHT - 0.75 * inch - 6
+_CONTENT_BOTTOM = 0.75 * inch + 6
+_CONTENT_WIDTH = _PAGE_WIDTH - 2 * _CONTENT_LEFT
+
+_TABLE_COL_WIDTHS = [80, 250, 40, 90]
+_TABLE_HEADER = ["Date", "Item", "Qty", "Net Sales"]
+_TABLE_LEFT = (_PAGE_WIDTH - sum(_TABLE_COL_WIDTHS)) / 2  # centred on the page
+_TABLE_COL_X = list(accumulate(_TABLE_COL_WIDTHS, initial=_TABLE_LEFT))
+_TABLE_ROW_HEIGHT = 20
+_CELL_PADDING = 6
+_CELL_LEADING = 12  # text baseline sits (leading - font size) above the padding
+_CELL_BOTTOM_PADDING = 4
+
+# Standard Type 1 fonts, looked up once and shared by every PDF; text widths
+# for aligned cells come straight from these rather than a registry lookup
+_HELVETICA = pdfmetrics.getFont("Helvetica")
+_HELVETICA_BOLD = pdfmetrics.getFont("Helvetica-Bold")
+
+_HEADER_BACKGROUND = colors.HexColor("#2c3e50")
+_SHADED_ROW_BACKGROUND = colors.HexColor("#f0f3f5")
+
+
+def _fill_table_row(c: canvas.Canvas, top: float, color: colors.Color) -> None:
+    c.setFillColor(color)
+    c.rect(
+        _TABLE_LEFT,
+        top - _TABLE_ROW_HEIGHT,
+        _TABLE_COL_X[-1] - _TABLE_LEFT,
+        _TABLE_ROW_HEIGHT,
+        stroke=0,
+        fill=1,
+    )
+    c.setFillColor(colors.black)
+
+
+def _draw_grid(c: canvas.Canvas, top: float, bottom: float) -> None:
+    """Draw the table grid over the rows placed between top and bottom."""
+    n_rows = round((top - bottom) / _TABLE_ROW_HEIGHT)
+    c.setLineWidth(0.5)
+    c.setStrokeColor(colors.grey)
+    c.grid(_TABLE_COL_X, [top - i * _TABLE_ROW_HEIGHT for i in range(n_rows + 1)])
+
+
+def _draw_table_row(
+    c: canvas.Canvas,
+    top: float,
+    cells: list[str],
+    font: pdfmetrics.Font,
+    size: int,
+) -> None:
+    """Draw one table row's text: date/item left, qty centred, amount right."""
+    x = _TABLE_COL_X
+    baseline = (
+        top - _TABLE_ROW_HEIGHT + _CELL_BOTTOM_PADDING + (_CELL_LEADING - size)
+    )
+    width = font.stringWidth
+    c.setFont(font.fontName, size)
+    c.drawString(x[0] + _CELL_PADDING, baseline, cells[0])
+    c.drawString(x[1] + _CELL_PADDING, baseline, cells[1])
+    c.drawString((x[2] + x[3] - width(cells[2], size)) / 2, baseline, cells[2])
+    c.drawString(x[4] - _CELL_PADDING - width(cells[3], size), baseline, cells[3])
+
+
 def _sanitise_filename(name: str) -> str:
     """Turn an artist name into a safe filename component."""
-    safe = re.sub(r"[^\w\s-]", "", name)  # strip non-alphanumeric (keep spaces/hyphens)
-    safe = re.sub(r"\s+", "_", safe.strip())  # spaces → underscores
+    if name.isascii():
+        # One C-level translate, then split()/join collapses whitespace runs
+        safe = "_".join(name.translate(_FILENAME_ASCII_TRANS).split())
+    else:
+        # Keep Unicode letters (e.g. accented names) via the \w-aware regexes
+        safe = _FILENAME_STRIP_RE.sub("", name)
+        safe = _FILENAME_WS_RE.sub("_", safe.strip())  # spaces → underscores
     return safe or "unknown"
 
 
 def generate_artist_pdf(report: ArtistReport) -> bytes:
     """Generate a single-artist PDF with their sales and commission summary."""
     buffer = io.BytesIO()
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=letter,
-        leftMargin=0.75 * inch,
-        rightMargin=0.75 * inch,
-        topMargin=0.75 * inch,
-        bottomMargin=0.75 * inch,
-    )
-    styles = getSampleStyleSheet()
-
-    artist_heading = ParagraphStyle(
-        "ArtistHeading",
-        parent=styles["Heading1"],
-        fontSize=16,
-        spaceAfter=6,
-    )
-    summary_style = ParagraphStyle(
-        "SummaryText",
-        parent=styles["Normal"],
-        fontSize=11,
-        spaceAfter=4,
-    )
-
-    elements: list = []
+    c = canvas.Canvas(buffer, pagesize=letter)
+    y = _CONTENT_TOP
 
     # Artist header
-    elements.append(Paragraph(report.name, artist_heading))
-    elements.append(
-        Paragraph(
-            f"Commission Rate: {report.commission_rate:.0%}",
-            summary_style,
-        )
+    # Long names wrap onto further lines rather than running off the page
+    heading = simpleSplit(
+        report.name, _HELVETICA_BOLD.fontName, 16, _CONTENT_WIDTH
+    ) or [""]
+    c.setFont(_HELVETICA_BOLD.fontName, 16)
+    for line in heading:
+        c.drawString(_CONTENT_LEFT, y - 16, line)
+        y -= 22
+    y -= 6
+    c.setFont(_HELVETICA.fontName, 11)
+    c.drawString(
+        _CONTENT_LEFT, y - 11, f"Commission Rate: {report.commission_rate:.0%}"
     )
-    elements.append(Spacer(1, 12))
-
-    # Sales table
-    col_widths = [80, 250, 40, 90]
-    header_row = ["Date", "Item", "Qty", "Net Sales"]
-    table_data: list[list[str]] = [header_row]
-
-    for sale in report.sales:
-        table_data.append(
-            [
-                sale.date,
-                sale.item,
-                str(sale.qty),
-                f"${sale.net_sales:,.2f}",
-            ]
-        )
+    y -= 12 + 4 + 12
+
+    # Sales table. Rows that don't fit continue on the next page; the grid is
+    # drawn per page once that page's rows are placed.
+    fmt = "${:,.2f}".format
+    rows = [[s.date, s.item, str(s.qty), fmt(s.net_sales)] for s in report.sales]
+    grid_top = y
+
+    _fill_table_row(c, y, _HEADER_BACKGROUND)
+    c.setFillColor(colors.white)
+    _draw_table_row(c, y, _TABLE_HEADER, _HELVETICA_BOLD, 10)
+    c.setFillColor(colors.black)
+    y -= _TABLE_ROW_HEIGHT
+
+    for row_idx, row in enumerate(rows):
+        if y - _TABLE_ROW_HEIGHT < _CONTENT_BOTTOM:
+            _draw_grid(c, grid_top, y)
+            c.showPage()
+            y = grid_top = _CONTENT_TOP
+        if row_idx % 2:  # alternating shading for data rows
+            _fill_table_row(c, y, _SHADED_ROW_BACKGROUND)
+        _draw_table_row(c, y, row, _HELVETICA, 9)
+        y -= _TABLE_ROW_HEIGHT
+    _draw_grid(c, grid_top, y)
 
     # Totals row
-    table_data.append(["", "TOTAL", "", f"${report.total_net_sales:,.2f}"])
-
-    table = Table(table_data, colWidths=col_widths)
-    style_commands = [
-        # Header
-        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#2c3e50")),
-        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("FONTSIZE", (0, 0), (-1, 0), 10),
-        # Data rows
-        ("FONTSIZE", (0, 1), (-1, -1), 9),
-        ("ALIGN", (2, 0), (2, -1), "CENTER"),
-        ("ALIGN", (3, 0), (3, -1), "RIGHT"),
-        # Totals row
-        ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
-        ("LINEABOVE", (0, -1), (-1, -1), 1, colors.black),
-        # Grid and padding
-        ("GRID", (0, 0), (-1, -2), 0.5, colors.grey),
-        ("TOPPADDING", (0, 0), (-1, -1), 4),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-    ]
-    # Alternating row shading for data rows
-    for row_idx in range(2, len(table_data) - 1, 2):
-        style_commands.append(
-            (
-                "BACKGROUND",
-                (0, row_idx),
-                (-1, row_idx),
-                colors.HexColor("#f0f3f5"),
-            )
-        )
-    table.setStyle(TableStyle(style_commands))
-    elements.append(table)
-    elements.append(Spacer(1, 20))
+    if y - _TABLE_ROW_HEIGHT < _CONTENT_BOTTOM:
+        c.showPage()
+        y = _CONTENT_TOP
+    c.setLineWidth(1)
+    c.setStrokeColor(colors.black)
+    c.line(_TABLE_LEFT, y, _TABLE_COL_X[-1], y)
+    _draw_table_row(
+        c, y, ["", "TOTAL", "", fmt(report.total_net_sales)], _HELVETICA_BOLD, 9
+    )
+    y -= _TABLE_ROW_HEIGHT + 20
 
     # Commission summary
-    elements.append(
-        Paragraph(
-            f"Total Net Sales: <b>${report.total_net_sales:,.2f}</b>",
-            summary_style,
-        )
-    )
-    elements.append(
-        Paragraph(
-            f"Gallery Commission ({report.commission_rate:.0%}): "
-            f"<b>${report.gallery_commission:,.2f}</b>",
-            summary_style,
-        )
-    )
-    elements.append(
-        Paragraph(
-            f"Artist Payout: <b>${report.artist_payout:,.2f}</b>",
-            summary_style,
-        )
+    summary = [
+        ("Total Net Sales: ", fmt(report.total_net_sales)),
+        (
+            f"Gallery Commission ({report.commission_rate:.0%}): ",
+            fmt(report.gallery_commission),
+        ),
+        ("Artist Payout: ", fmt(report.artist_payout)),
+    ]
+    for label, value in summary:
+        if y - 12 < _CONTENT_BOTTOM:
+            c.showPage()
+            y = _CONTENT_TOP
+        c.setFont(_HELVETICA.fontName, 11)
+        c.drawString(_CONTENT_LEFT, y - 11, label)
+        c.setFont(_HELVETICA_BOLD.fontName, 11)
+        c.drawString(_CONTENT_LEFT + _HELVETICA.stringWidth(label, 11), y - 11, value)
+        y -= 12 + 4
+
+    c.save()
+    # getvalue() hands back the buffer's bytes without the copy seek()/read() makes
+    return buffer.getvalue()
+
+
+# Bounded so a long-running shared server doesn't keep every upload's PDFs
+@st.cache_data(show_spinner=False, max_entries=500, ttl="1h")
+def _pdf_for(
+    name: str,
+    commission_rate: float,
+    sales: tuple[tuple[str, str, int, float], ...],
+) -> bytes:
+    """Cached generate_artist_pdf, keyed on the report's content as plain tuples."""
+    report = ArtistReport(
+        name=name,
+        commission_rate=commission_rate,
+        sales=[SaleRecord(*sale) for sale in sales],
     )
+    return generate_artist_pdf(report)
 
-    doc.build(elements)
-    buffer.seek(0)
-    return buffer.read()
+
+def _report_pdf(report: ArtistReport) -> bytes:
+    return _pdf_for(
+        report.name,
+        report.commission_rate,
+        tuple((s.date, s.item, s.qty, s.net_sales) for s in report.sales),
+    )
 
 
 def generate_all_pdfs_zip(artists: dict[str, ArtistReport]) -> bytes:
     """Generate a ZIP containing one PDF per artist inside a 'commission_reports/' folder."""
     zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+    # Page streams are already Flate-compressed by ReportLab; level 1 still
+    # shrinks the uncompressed PDF object/xref text for far less CPU.
+    with zipfile.ZipFile(
+        zip_buffer, "w", zipfile.ZIP_DEFLATED, compresslevel=1
+    ) as zf:
         for report in sorted(artists.values(), key=lambda a: a.name):
-            pdf_bytes = generate_artist_pdf(report)
+            pdf_bytes = _report_pdf(report)
             filename = f"commission_reports/{_sanitise_filename(report.name)}.pdf"
             zf.writestr(filename, pdf_bytes)
-    zip_buffer.seek(0)
-    return zip_buffer.read()
+    return zip_buffer.getvalue()
+
+
+# ---------------------------------------------------------------------------
+# Cached pipeline
+# ---------------------------------------------------------------------------
+
+REQUIRED_COLUMNS = {"Category", "Net Sales", "Item", "Qty", "Date"}
+
+
+def _read_sales_csv(raw: bytes, encoding: str) -> pd.DataFrame:
+    # Only the header's columns are parsed, so a row with extra trailing
+    # fields is read by its named columns (as csv.DictReader did) instead of
+    # shifting the columns or failing the whole upload
+    header = pd.read_csv(io.BytesIO(raw), encoding=encoding, nrows=0).columns
+    return pd.read_csv(
+        io.BytesIO(raw),
+        encoding=encoding,
+        dtype=str,
+        keep_default_na=False,
+        usecols=range(len(header)),
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=8, ttl="1h")
+def _pipeline(
+    raw: bytes,
+) -> tuple[dict[str, ArtistReport], pd.DataFrame, bytes]:
+    """Decode, parse and process an uploaded CSV and build its report ZIP.
+
+    Cached on the raw upload bytes so Streamlit reruns (download clicks,
+    expander toggles) reuse the generated artifacts. Raises ValueError if
+    the CSV cannot be parsed or required columns are missing.
+    """
+    # Parse straight from the bytes so the decode streams through the parser
+    # instead of materialising the whole file as a str first. "utf-8-sig"
+    # also drops the BOM some spreadsheet exports prepend to the header.
+    try:
+        try:
+            df = _read_sales_csv(raw, "utf-8-sig")
+        except UnicodeDecodeError:
+            df = _read_sales_csv(raw, "latin-1")
+    except pd.errors.EmptyDataError:
+        df = pd.DataFrame(columns=sorted(REQUIRED_COLUMNS), dtype=str)
+    except pd.errors.ParserError as exc:
+        raise ValueError(f"CSV could not be parsed ({str(exc).strip()}).") from exc
+
+    # Validate required columns
+    missing = REQUIRED_COLUMNS - set(df.columns)
+    if missing:
+        raise ValueError(
+            f"CSV is missing required columns: {', '.join(sorted(missing))}."
+        )
+
+    artists, skipped = process_csv(df)
+    zip_bytes = generate_all_pdfs_zip(artists) if artists else b""
+    return (artists, skipped, zip_bytes)
 
 
 # ---------------------------------------------------------------------------
@@ -292,33 +460,16 @@ st.title("Art Gallery Commission Report Generator")
 uploaded_file = st.file_uploader("Upload a Square POS CSV export", type=["csv"])
 
 if uploaded_file is not None:
-    # Decode with fallback
-    raw = uploaded_file.read()
     try:
-        content = raw.decode("utf-8")
-    except UnicodeDecodeError:
-        content = raw.decode("latin-1")
-
-    reader = csv.DictReader(io.StringIO(content))
-    rows = list(reader)
-
-    # Validate required columns
-    required_columns = {"Category", "Net Sales", "Item", "Qty", "Date"}
-    if rows:
-        actual_columns = set(rows[0].keys())
-        missing = required_columns - actual_columns
-        if missing:
-            st.error(
-                f"CSV is missing required columns: {', '.join(sorted(missing))}. "
-                "Please upload a Square POS export with the expected format."
-            )
-            st.stop()
-
-    # Process data
-    artists, skipped_rows = process_csv(rows)
+        artists, skipped_rows, zip_bytes = _pipeline(uploaded_file.getvalue())
+    except ValueError as exc:
+        st.error(
+            f"{exc} Please upload a Square POS export with the expected format."
+        )
+        st.stop()
 
     # Warning for None/empty categories
-    if skipped_rows:
+    if not skipped_rows.empty:
         with st.expander(
             f":warning: {len(skipped_rows)} row(s) with no artist category",
             expanded=True,
@@ -328,39 +479,33 @@ if uploaded_file is not None:
                 "from artist reports."
             )
             st.dataframe(
-                [
-                    {
-                        "Date": r.get("Date", ""),
-                        "Item": r.get("Item", ""),
-                        "Net Sales": r.get("Net Sales", ""),
-                    }
-                    for r in skipped_rows
-                ]
+                skipped_rows[["Date", "Item", "Net Sales"]], hide_index=True
             )
 
     # Summary table
     if artists:
         st.subheader("Commission Summary")
-        summary_data = []
-        for report in sorted(artists.values(), key=lambda a: a.name):
-            summary_data.append(
-                {
-                    "Artist": report.name,
-                    "Commission Rate": f"{report.commission_rate:.0%}",
-                    "Total Net Sales": f"${report.total_net_sales:,.2f}",
-                    "Gallery Commission": f"${report.gallery_commission:,.2f}",
-                    "Artist Payout": f"${report.artist_payout:,.2f}",
-                }
-            )
-        st.dataframe(summary_data, use_container_width=True)
+        reports = sorted(artists.values(), key=lambda a: a.name)
+        fmt = "${:,.2f}".format
+        # Column lists rather than a dict per artist; Streamlit sends the
+        # DataFrame to the browser as Arrow
+        summary = pd.DataFrame(
+            {
+                "Artist": [r.name for r in reports],
+                "Commission Rate": [f"{r.commission_rate:.0%}" for r in reports],
+                "Total Net Sales": [fmt(r.total_net_sales) for r in reports],
+                "Gallery Commission": [fmt(r.gallery_commission) for r in reports],
+                "Artist Payout": [fmt(r.artist_payout) for r in reports],
+            }
+        )
+        st.dataframe(summary, use_container_width=True, hide_index=True)
 
         # ZIP download (one PDF per artist in a folder)
-        zip_bytes = generate_all_pdfs_zip(artists)
         st.download_button(
             label="Download All Reports (ZIP)",
             data=zip_bytes,
             file_name="commission_reports.zip",
             mime="application/zip",
         )
-    elif not skipped_rows:
+    elif skipped_rows.empty:
         st.warning("No data found in the uploaded CSV.")
@@ -0,0 +1,108 @@
+import random
+import unittest
+
+import pandas as pd
+
+import app
+
+
+class ReadSalesCsvTest(unittest.TestCase):
+    def test_trailing_comma_does_not_shift_columns(self):
+        raw = (
+            b"Date,Category,Item,Qty,Net Sales\n"
+            b"2024-01-02,Alice (20),Vase,1,$25.00,\n"
+        )
+        artists, skipped = app.process_csv(app._read_sales_csv(raw, "utf-8-sig"))
+
+        self.assertTrue(skipped.empty)
+        report = artists["Alice"]
+        self.assertEqual(report.commission_rate, 0.2)
+        self.assertEqual(len(report.sales), 1)
+        sale = report.sales[0]
+        self.assertEqual(sale.date, "2024-01-02")
+        self.assertEqual(sale.item, "Vase")
+        self.assertEqual(sale.qty, 1)
+        self.assertEqual(sale.net_sales, 25.0)
+
+    def test_extra_field_mid_file_is_ignored(self):
+        raw = (
+            b"Date,Category,Item,Qty,Net Sales\n"
+            b"2024-01-01,Ann (20),X,1,$4\n"
+            b"2024-01-02,Ann (20),Y,1,$5,extra\n"
+        )
+        artists, skipped = app.process_csv(app._read_sales_csv(raw, "utf-8-sig"))
+
+        self.assertTrue(skipped.empty)
+        sales = artists["Ann"].sales
+        self.assertEqual(
+            [(s.date, s.item, s.qty, s.net_sales) for s in sales],
+            [("2024-01-01", "X", 1, 4.0), ("2024-01-02", "Y", 1, 5.0)],
+        )
+
+
+class ProcessCsvTest(unittest.TestCase):
+    def test_sales_sorted_by_date_with_ties_in_file_order(self):
+        raw = (
+            b"Date,Category,Item,Qty,Net Sales\n"
+            b"2024-01-03,Ann (20),A,1,$1\n"
+            b"2024-01-01,Bob (10),B,1,$2\n"
+            b"2024-01-01,Ann (20),C,1,$3\n"
+            b"2024-01-02,Ann (30),D,1,$4\n"
+            b"2024-01-01,Ann (20),E,1,$5\n"
+        )
+        artists, _ = app.process_csv(app._read_sales_csv(raw, "utf-8-sig"))
+
+        self.assertEqual(list(artists), ["Ann", "Bob"])
+        self.assertEqual(
+            [(s.date, s.item) for s in artists["Ann"].sales],
+            [
+                ("2024-01-01", "C"),
+                ("2024-01-01", "E"),
+                ("2024-01-02", "D"),
+                ("2024-01-03", "A"),
+            ],
+        )
+        self.assertEqual([s.item for s in artists["Bob"].sales], ["B"])
+
+    def test_artist_keeps_rate_from_first_sale(self):
+        raw = (
+            b"Date,Category,Item,Qty,Net Sales\n"
+            b"2024-01-02,Ann (20),A,1,$100\n"
+            b"2024-01-01,Ann (30),B,1,$100\n"
+        )
+        artists, _ = app.process_csv(app._read_sales_csv(raw, "utf-8-sig"))
+
+        report = artists["Ann"]
+        self.assertEqual(report.commission_rate, 0.2)
+        self.assertEqual(report.gallery_commission, 40.0)
+
+
+class ParseQtysTest(unittest.TestCase):
+    def test_out_of_range_quantities_parse_as_zero(self):
+        values = pd.Series(["2", "2.9", "1e20", "-1e20", "inf", "abc", ""])
+        self.assertEqual(app.parse_qtys(values).tolist(), [2, 2, 0, 0, 0, 0, 0])
+
+
+class SanitiseFilenameTest(unittest.TestCase):
+    @staticmethod
+    def _regex_path(name):
+        safe = app._FILENAME_STRIP_RE.sub("", name)
+        return app._FILENAME_WS_RE.sub("_", safe.strip()) or "unknown"
+
+    def test_ascii_fast_path_matches_regex_path(self):
+        alphabet = [chr(i) for i in range(128)]
+        names = alphabet + ["", "  ", "Ann  Lee", " #Ann-Lee_2 ", "a\x1cb\x1fc"]
+        rng = random.Random(0)
+        names += [
+            "".join(rng.choices(alphabet, k=rng.randint(1, 12))) for _ in range(2000)
+        ]
+        for name in names:
+            with self.subTest(name=name):
+                self.assertEqual(app._sanitise_filename(name), self._regex_path(name))
+
+    def test_non_ascii_names_keep_letters(self):
+        self.assertEqual(app._sanitise_filename("José  Núñez!"), "José_Núñez")
+
+
+if __name__ == "__main__":
+    unittest.main()